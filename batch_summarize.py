@@ -0,0 +1,239 @@
+#!/usr/bin/env python3
+"""
+Offline batch summarization for a directory of PDFs
+Extraction runs on a process pool, LLM calls with bounded concurrency.
+The JSONL output doubles as the checkpoint: rerunning skips papers already summarized
+successfully and retries errors and extractive fallbacks (the latest line for a paper wins).
+
+Usage:
+    python batch_summarize.py proceedings/ -o summaries.jsonl --level technical
+"""
+
+import argparse
+import json
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, wait, FIRST_COMPLETED
+from pathlib import Path
+from typing import Dict, Set
+
+from config import EXTRACTIVE_MODE, OLLAMA_MODEL
+from paper_parser import extract_text_from_pdf, build_paper
+from section_summarizer import generate_multi_level_summary
+from paper import Paper
+from figure_index import FigureIndex
+from ollama_manager import preload_model
+
+SUMMARY_LEVELS = ["eli5", "technical", "expert", EXTRACTIVE_MODE]
+
+
+def load_checkpoint(output_path: Path) -> Set[str]:
+    """Return paper ids summarized cleanly so far, dropping a line cut off by a crash.
+
+    Errors and papers with extractive fallback sections (e.g. Ollama was down)
+    are not counted, so a rerun retries them.
+    """
+    if not output_path.exists():
+        return set()
+
+    with open(output_path, "rb+") as f:
+        data = f.read()
+        complete = data.rfind(b"\n") + 1
+        if complete < len(data):
+            f.truncate(complete)
+
+    done = set()
+    for line in data[:complete].splitlines():
+        try:
+            record = json.loads(line)
+            paper_id = record["paper_id"]
+        except (ValueError, KeyError):
+            continue
+        if record.get("status") == "success" and not record.get("extractive_fallback"):
+            done.add(paper_id)
+        else:
+            # A later line may be the retry of an earlier success; the latest line wins
+            done.discard(paper_id)
+    return done
+
+
+def parse_pdf(path: str, paper_id: str, summary_level: str) -> Dict:
+    """Process-pool worker: extract and parse one PDF (and summarize it if no LLM is needed)."""
+    figure_index = FigureIndex()
+    text = extract_text_from_pdf(path, figure_index)
+    paper = build_paper(text, figure_index.entries())
+    parsed = {
+        "paper_id": paper_id,
+        "path": path,
+        "title": paper.title,
+        "authors": paper.authors,
+        "text": paper.text,
+        "section_spans": paper.section_spans,
+        "figures": paper.figures,
+    }
+    if summary_level == EXTRACTIVE_MODE:
+        parsed["summaries"], parsed["extractive_fallback"] = generate_multi_level_summary(paper, summary_level)
+    return parsed
+
+
+def summarize_parsed(parsed: Dict, summary_level: str) -> Dict:
+    """Thread-pool worker: summarize a parsed paper with the LLM."""
+    if "summaries" not in parsed:
+        paper = Paper(
+            title=parsed["title"],
+            authors=parsed["authors"],
+            abstract="",
+            text=parsed["text"],
+            section_spans=parsed["section_spans"],
+            source="upload",
+        )
+        parsed["summaries"], parsed["extractive_fallback"] = generate_multi_level_summary(paper, summary_level)
+    return parsed
+
+
+def to_record(parsed: Dict, summary_level: str) -> Dict:
+    return {
+        "paper_id": parsed["paper_id"],
+        "path": parsed["path"],
+        "status": "success",
+        "title": parsed["title"],
+        "authors": parsed["authors"],
+        "sections": list(parsed["section_spans"]),
+        "text_length": len(parsed["text"]),
+        "figures": parsed["figures"],
+        "summary_level": summary_level,
+        "model": None if summary_level == EXTRACTIVE_MODE else OLLAMA_MODEL,
+        "summaries": parsed["summaries"],
+        "extractive_fallback": parsed["extractive_fallback"],
+    }
+
+
+def error_record(paper_id: str, path: str, error: Exception) -> Dict:
+    return {"paper_id": paper_id, "path": path, "status": "error", "error": str(error)}
+
+
+def run_batch(input_dir: Path, output_path: Path, summary_level: str, workers: int, concurrency: int) -> int:
+    """Summarize every PDF under input_dir, appending one JSON line per paper."""
+    pdfs = sorted(input_dir.rglob("*.pdf"))
+    done = load_checkpoint(output_path)
+    todo = [
+        (str(path), path.relative_to(input_dir).with_suffix("").as_posix())
+        for path in pdfs
+    ]
+    todo = [(path, paper_id) for path, paper_id in todo if paper_id not in done]
+    print(f"{len(pdfs)} PDFs found, {len(pdfs) - len(todo)} already done, {len(todo)} to process")
+
+    if todo and summary_level != EXTRACTIVE_MODE and not preload_model():
+        print("⚠️  Could not load the Ollama model; sections will fall back to extractive summaries")
+
+    # Backpressure: never hold more parsed papers in memory than the LLM stage can take
+    max_extracting = workers * 2
+    max_summarizing = concurrency * 2
+
+    pending = iter(todo)
+    extracting = {}
+    summarizing = {}
+    completed = 0
+    start_time = time.time()
+
+    with ProcessPoolExecutor(max_workers=workers) as processes, \
+            ThreadPoolExecutor(max_workers=concurrency) as threads, \
+            open(output_path, "a", encoding="utf-8") as out:
+
+        def fill():
+            while len(extracting) < max_extracting and len(summarizing) < max_summarizing:
+                item = next(pending, None)
+                if item is None:
+                    return
+                path, paper_id = item
+                extracting[processes.submit(parse_pdf, path, paper_id, summary_level)] = item
+
+        def write(record: Dict):
+            nonlocal completed
+            out.write(json.dumps(record, ensure_ascii=False) + "\n")
+            out.flush()
+            completed += 1
+            rate = completed / max(time.time() - start_time, 1e-9)
+            print(f"[{completed}/{len(todo)}] {record['paper_id']} - {record['status']} ({rate:.1f} papers/s)")
+
+        fill()
+        while extracting or summarizing:
+            finished, _ = wait(list(extracting) + list(summarizing), return_when=FIRST_COMPLETED)
+            for future in finished:
+                if future in extracting:
+                    path, paper_id = extracting.pop(future)
+                    try:
+                        parsed = future.result()
+                    except Exception as e:
+                        write(error_record(paper_id, path, e))
+                        continue
+                    summarizing[threads.submit(summarize_parsed, parsed, summary_level)] = (path, paper_id)
+                else:
+                    path, paper_id = summarizing.pop(future)
+                    try:
+                        write(to_record(future.result(), summary_level))
+                    except Exception as e:
+                        write(error_record(paper_id, path, e))
+            fill()
+
+    return completed
+
+
+def write_parquet(output_path: Path, parquet_path: Path):
+    """Convert the JSONL output to Parquet (requires pyarrow)."""
+    try:
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+    except ImportError:
+        sys.exit("Parquet output requires pyarrow: pip install pyarrow")
+
+    # Retried papers appear more than once; keep the latest line for each
+    latest = {}
+    with open(output_path, "r", encoding="utf-8") as f:
+        for line in f:
+            record = json.loads(line)
+            # Nested section summaries are stored as a JSON string column
+            for key in ("summaries", "extractive_fallback", "sections", "authors", "figures"):
+                if key in record:
+                    record[key] = json.dumps(record[key], ensure_ascii=False)
+            latest[record["paper_id"]] = record
+
+    # from_pylist takes its columns from the first row, and error rows lack the summary fields
+    # (success rows lack "error"), so give every row the union of all keys, success fields first
+    ordered = sorted(latest.values(), key=lambda record: record["status"] != "success")
+    columns = list(dict.fromkeys(key for record in ordered for key in record))
+    rows = [{key: record.get(key) for key in columns} for record in latest.values()]
+    pq.write_table(pa.Table.from_pylist(rows), parquet_path)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Summarize a directory of research papers")
+    parser.add_argument("input_dir", type=Path, help="Directory searched recursively for PDFs")
+    parser.add_argument("-o", "--output", type=Path, default=Path("summaries.jsonl"),
+                        help="JSONL output; also the resume checkpoint (default: summaries.jsonl)")
+    parser.add_argument("--level", choices=SUMMARY_LEVELS, default="technical",
+                        help="Summary level (default: technical)")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1,
+                        help="Processes for PDF extraction (default: CPU count)")
+    parser.add_argument("--concurrency", type=int, default=2,
+                        help="Concurrent Ollama requests (default: 2)")
+    parser.add_argument("--parquet", type=Path, help="Also write the results to this Parquet file")
+    args = parser.parse_args()
+
+    if not args.input_dir.is_dir():
+        sys.exit(f"Not a directory: {args.input_dir}")
+
+    try:
+        run_batch(args.input_dir, args.output, args.level, args.workers, args.concurrency)
+    except KeyboardInterrupt:
+        print("\nInterrupted. Rerun the same command to resume.")
+        sys.exit(1)
+
+    if args.parquet:
+        write_parquet(args.output, args.parquet)
+        print(f"✓ Parquet written to {args.parquet}")
+
+
+if __name__ == "__main__":
+    main()
@@ -19,6 +19,15 @@ UPLOAD_DIR = "uploads"
 MAX_FILE_SIZE = 50 * 1024 * 1024  # 50MB
 ALLOWED_EXTENSIONS = {".pdf"}
 
+# Section summary cache (reused when a new paper version leaves a section unchanged)
+SUMMARY_CACHE_DIR = "cache"
+
+# Parsed paper text (memory-mapped) and section offsets
+PAPER_CACHE_DIR = os.path.join(SUMMARY_CACHE_DIR, "papers")
+
+# Cache-Control max-age for GET /summaries (fallback summaries are always revalidated)
+SUMMARY_MAX_AGE = 86400
+
 # Summarization Configuration
 SUMMARY_LENGTHS = {
     "short": "Provide a concise summary in 2-3 paragraphs.",
@@ -28,6 +37,38 @@ SUMMARY_LENGTHS = {
 
 DEFAULT_SUMMARY_LENGTH = "medium"
 
+# Extractive (no LLM) mode, also used as fallback when Ollama fails
+EXTRACTIVE_MODE = "extractive"
+EXTRACTIVE_SENTENCE_COUNTS = {
+    "short": 3,
+    "medium": 6,
+    "long": 10,
+}
+EXTRACTIVE_SECTION_SENTENCES = 3  # per section in the advanced app
+
+# Ollama Configuration
+OLLAMA_BASE_URL = os.getenv("OLLAMA_BASE_URL", "http://localhost:11434")
+OLLAMA_API_URL = f"{OLLAMA_BASE_URL}/api/generate"
+OLLAMA_MODEL = os.getenv("OLLAMA_MODEL", "orca-mini")
+OLLAMA_TIMEOUT = 120
+
+# Model residency: how long Ollama keeps the model loaded after each request
+OLLAMA_KEEP_ALIVE = os.getenv("OLLAMA_KEEP_ALIVE", "30m")
+OLLAMA_LOAD_TIMEOUT = 300  # Loading a model from disk can take minutes
+
+# Background keeper re-pins the model during business hours (local time)
+MODEL_KEEPER_INTERVAL = 240  # seconds between residency checks
+MODEL_KEEPER_DAYS = {0, 1, 2, 3, 4}  # Monday-Friday
+MODEL_KEEPER_HOURS = (8, 18)  # 08:00-18:00
+
+# Prompt context budget (tokens of paper text per prompt), per model
+CONTEXT_TOKEN_BUDGETS = {
+    "orca-mini": 500,
+    "llama2": 1500,
+    "mistral": 2500,
+}
+DEFAULT_CONTEXT_TOKEN_BUDGET = 500
+
 # CORS Configuration
 CORS_ORIGINS = ["*"]
 CORS_CREDENTIALS = True
@@ -0,0 +1,94 @@
+"""
+Salience-based context packing
+Fills a prompt token budget with the most central sentences of a section, in original order
+"""
+
+import re
+from typing import List
+
+import numpy as np
+from sklearn.feature_extraction.text import TfidfVectorizer
+
+from config import CONTEXT_TOKEN_BUDGETS, DEFAULT_CONTEXT_TOKEN_BUDGET
+
+# Sentence boundary: terminal punctuation followed by whitespace and a likely sentence start
+SENTENCE_BOUNDARY = re.compile(r"(?<=[.!?]) (?=[A-Z0-9(\[])")
+HAS_NUMBER = re.compile(r"\d")
+
+# Sentences reporting numbers (results, metrics) get a small salience boost
+NUMBER_BONUS = 0.25
+
+# Sentences this similar to one already packed are treated as duplicates
+REDUNDANCY_THRESHOLD = 0.8
+
+
+def context_budget(model: str) -> int:
+    """Token budget for paper text in a single prompt to this model."""
+    return CONTEXT_TOKEN_BUDGETS.get(model.split(":")[0], DEFAULT_CONTEXT_TOKEN_BUDGET)
+
+
+def estimate_tokens(text: str) -> int:
+    """Rough token count (~4 characters per token for English text)."""
+    return max(1, len(text) // 4)
+
+
+def split_sentences(text: str) -> List[str]:
+    """Split extracted PDF text into sentences, collapsing line breaks."""
+    # str.split() is much faster than re.sub on whole papers
+    text = " ".join(text.split())
+    return [s for s in SENTENCE_BOUNDARY.split(text) if s]
+
+
+def sentence_vectors(sentences: List[str]):
+    """L2-normalised TF-IDF rows for each sentence, or None if there is no vocabulary."""
+    try:
+        return TfidfVectorizer(stop_words="english", sublinear_tf=True).fit_transform(sentences)
+    except ValueError:
+        # Empty vocabulary (e.g. only stop words or symbols)
+        return None
+
+
+def score_sentences(sentences: List[str], vectors=None) -> np.ndarray:
+    """Score each sentence by TF-IDF cosine similarity to the section centroid."""
+    if vectors is None:
+        vectors = sentence_vectors(sentences)
+    if vectors is None:
+        return np.zeros(len(sentences))
+
+    centroid = np.asarray(vectors.mean(axis=0)).ravel()
+    norm = np.linalg.norm(centroid)
+    if norm == 0:
+        return np.zeros(len(sentences))
+    scores = vectors @ (centroid / norm)
+
+    has_number = np.fromiter((bool(HAS_NUMBER.search(s)) for s in sentences), dtype=bool, count=len(sentences))
+    return scores * (1.0 + NUMBER_BONUS * has_number)
+
+
+def pack_context(text: str, token_budget: int) -> str:
+    """Return the most salient sentences of text that fit in token_budget, in original order."""
+    if estimate_tokens(text) <= token_budget:
+        return text
+
+    sentences = split_sentences(text)
+    if len(sentences) <= 1:
+        return text[:token_budget * 4]
+
+    vectors = sentence_vectors(sentences)
+    scores = score_sentences(sentences, vectors)
+    costs = [estimate_tokens(s) for s in sentences]
+
+    chosen = []
+    used = 0
+    for i in np.argsort(-scores, kind="stable"):
+        if used + costs[i] > token_budget:
+            continue
+        # Skip near-duplicates of sentences already packed (repeated headers, boilerplate)
+        if vectors is not None and chosen and (vectors[chosen] @ vectors[i].T).max() > REDUNDANCY_THRESHOLD:
+            continue
+        chosen.append(i)
+        used += costs[i]
+
+    if not chosen:
+        return text[:token_budget * 4]
+    return " ".join(sentences[i] for i in sorted(chosen))
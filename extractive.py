@@ -0,0 +1,115 @@
+"""
+Local extractive summarization (no LLM)
+TextRank over a sparse TF-IDF sentence similarity graph; runs in milliseconds per paper
+"""
+
+from itertools import chain
+
+import numpy as np
+from scipy import sparse
+from sklearn.feature_extraction.text import ENGLISH_STOP_WORDS
+
+from context_packer import split_sentences
+
+# Bytes that make up tokens once text is lowercased; everything else separates tokens
+_TOKEN_BYTES = set(b"abcdefghijklmnopqrstuvwxyz0123456789_") | set(range(128, 256))
+TOKEN_TABLE = bytes(b if b in _TOKEN_BYTES else ord(" ") for b in range(256))
+STOP_WORDS = frozenset(word.encode("ascii") for word in ENGLISH_STOP_WORDS)
+
+# Similarities below this are dropped so the sentence graph stays sparse
+MIN_SIMILARITY = 0.05
+
+DAMPING = 0.85
+MAX_ITERATIONS = 50
+TOLERANCE = 1e-6
+
+# Very short fragments (page numbers, headers) are not worth extracting
+MIN_SENTENCE_CHARS = 30
+
+# Output cap per requested sentence, for text where sentence splitting finds few boundaries
+MAX_SENTENCE_CHARS = 400
+
+
+def cap_length(text: str, max_chars: int) -> str:
+    """Cut text at a word boundary so it is at most max_chars long."""
+    if len(text) <= max_chars:
+        return text
+    return text[:max_chars].rsplit(" ", 1)[0] + " ..."
+
+
+def fast_sentence_vectors(sentences):
+    """L2-normalised TF-IDF rows like context_packer.sentence_vectors, without fitting a TfidfVectorizer.
+
+    Tokenizes with a byte translation table and builds the sparse matrix directly,
+    which is several times faster for triage. Returns None if there is no vocabulary.
+    """
+    n = len(sentences)
+    tokenized = [s.lower().encode("utf-8").translate(TOKEN_TABLE).split() for s in sentences]
+    tokens = list(chain.from_iterable(tokenized))
+    vocabulary = {token: i for i, token in enumerate(dict.fromkeys(tokens))}
+
+    # Same vocabulary filter as the TfidfVectorizer: no stop words or single characters
+    ignored = np.fromiter(map(len, vocabulary), dtype=np.intp, count=len(vocabulary)) < 2
+    ignored[[vocabulary[t] for t in vocabulary.keys() & STOP_WORDS]] = True
+    columns = np.fromiter(map(vocabulary.__getitem__, tokens), dtype=np.intp, count=len(tokens))
+    rows = np.repeat(np.arange(n), [len(t) for t in tokenized])
+    keep = ~ignored[columns]
+    if not keep.any():
+        return None
+
+    counts = sparse.csr_matrix((np.ones(keep.sum()), (rows[keep], columns[keep])), shape=(n, len(vocabulary)))
+    counts.sum_duplicates()
+
+    # Sublinear tf and smoothed idf, as TfidfVectorizer(sublinear_tf=True) computes them
+    df = np.bincount(counts.indices, minlength=counts.shape[1])
+    idf = np.log((1 + n) / (1 + df)) + 1
+    counts.data = (1 + np.log(counts.data)) * idf[counts.indices]
+
+    # L2-normalise rows in place (sklearn's normalize costs more in argument checks than in maths)
+    norms = np.sqrt(np.asarray(counts.multiply(counts).sum(axis=1)).ravel())
+    counts.data /= np.repeat(np.where(norms > 0, norms, 1.0), np.diff(counts.indptr))
+    return counts
+
+
+def textrank_scores(vectors) -> np.ndarray:
+    """PageRank over the sentence similarity graph built from L2-normalised TF-IDF rows."""
+    n = vectors.shape[0]
+    similarity = sparse.csr_matrix(vectors @ vectors.T)
+    similarity.setdiag(0)
+    similarity.data[similarity.data < MIN_SIMILARITY] = 0
+    similarity.eliminate_zeros()
+
+    # Row-normalise into a transition matrix; dangling sentences jump uniformly
+    out_weight = np.asarray(similarity.sum(axis=1)).ravel()
+    dangling = out_weight == 0
+    inv_weight = np.divide(1.0, out_weight, out=np.zeros(n), where=~dangling)
+    # Transposed once here rather than on every iteration
+    transition_t = (sparse.diags(inv_weight) @ similarity).T.tocsr()
+
+    scores = np.full(n, 1.0 / n)
+    for _ in range(MAX_ITERATIONS):
+        updated = (1 - DAMPING) / n + DAMPING * (transition_t @ scores + scores[dangling].sum() / n)
+        if np.abs(updated - scores).sum() < TOLERANCE:
+            return updated
+        scores = updated
+    return scores
+
+
+def extractive_summary(text: str, num_sentences: int) -> str:
+    """Return the num_sentences highest-ranked sentences of text, in original order."""
+    all_sentences = split_sentences(text)
+    # If every fragment is short, rank them anyway rather than return nothing
+    sentences = [s for s in all_sentences if len(s) >= MIN_SENTENCE_CHARS] or all_sentences
+    max_chars = num_sentences * MAX_SENTENCE_CHARS
+
+    if len(sentences) <= num_sentences:
+        return cap_length(" ".join(sentences), max_chars)
+
+    vectors = fast_sentence_vectors(sentences)
+    if vectors is None:
+        return cap_length(" ".join(sentences[:num_sentences]), max_chars)
+
+    scores = textrank_scores(vectors)
+    top = np.argsort(-scores, kind="stable")[:num_sentences]
+    return cap_length(" ".join(sentences[i] for i in sorted(top)), max_chars)
+
@@ -0,0 +1,48 @@
+"""
+Figure and table index
+Built page by page while text is extracted: one entry per figure/table with caption, first page and mention count
+"""
+
+import re
+from typing import Dict, List
+
+# A mention anywhere, or a caption when it starts a line ("Figure 2: ...", "Table 1. ...")
+# The label and number must be on the same line, or "results table" + "5. Conclusion" reads as Table 5
+FIGURE_MENTION = re.compile(r"(?im)(^[ \t]*)?\b(figure|fig\.|table|tbl\.)[ \t]+(\d+[a-z]?)\b")
+CAPTION_TAIL = re.compile(r"[ \t]*[:.|][ \t]*(\S[^\n]*)")
+
+MAX_CAPTION_CHARS = 300
+
+
+class FigureIndex:
+    """Deduplicated figures and tables of one paper."""
+
+    def __init__(self):
+        self._entries: Dict[str, Dict] = {}
+
+    def add_page(self, page_number: int, text: str):
+        """Index the mentions and captions on one page (1-based page number)."""
+        for match in FIGURE_MENTION.finditer(text):
+            line_start, keyword, number = match.groups()
+            kind = "table" if keyword.lower().startswith("t") else "figure"
+            label = f"{kind.capitalize()} {number.lower()}"
+
+            entry = self._entries.get(label)
+            if entry is None:
+                entry = self._entries[label] = {
+                    "label": label,
+                    "kind": kind,
+                    "caption": None,
+                    "page": page_number,
+                    "mentions": 0,
+                }
+            entry["mentions"] += 1
+
+            if line_start is not None and entry["caption"] is None:
+                caption = CAPTION_TAIL.match(text, match.end())
+                if caption:
+                    entry["caption"] = caption.group(1).strip()[:MAX_CAPTION_CHARS]
+
+    def entries(self) -> List[Dict]:
+        """Entries ordered figures first, then tables, each by first appearance."""
+        return sorted(self._entries.values(), key=lambda entry: (entry["kind"] != "figure", entry["page"]))
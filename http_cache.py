@@ -0,0 +1,66 @@
+"""
+HTTP caching for stored JSON resources
+Strong ETags, If-None-Match revalidation and gzip/br content negotiation
+over the validators and compressed bodies precomputed by SummaryCache
+"""
+
+from typing import List, Optional, Set
+
+from fastapi import Request
+from fastapi.responses import Response
+
+from summary_cache import StoredResource
+
+
+def accepted_encodings(header: Optional[str]) -> Set[str]:
+    """Content codings from an Accept-Encoding header, excluding those with q=0."""
+    encodings = set()
+    for item in (header or "").split(","):
+        name, *params = [part.strip() for part in item.split(";")]
+        quality = 1.0
+        for param in params:
+            key, _, value = param.partition("=")
+            if key.strip().lower() == "q":
+                try:
+                    quality = float(value)
+                except ValueError:
+                    quality = 0.0
+        if name and quality > 0:
+            encodings.add(name.lower())
+    return encodings
+
+
+def negotiate_encoding(request: Request, available: List[str]) -> Optional[str]:
+    """Pick br, then gzip, among the stored encodings the client accepts."""
+    accepted = accepted_encodings(request.headers.get("accept-encoding"))
+    if "br" in available and "br" in accepted:
+        return "br"
+    if "gzip" in available and ("gzip" in accepted or "*" in accepted):
+        return "gzip"
+    return None
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """If-None-Match uses weak comparison, so a W/ prefix is ignored."""
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    candidates = (tag.strip() for tag in if_none_match.split(","))
+    return etag in (tag[2:] if tag.startswith("W/") else tag for tag in candidates)
+
+
+def cached_json_response(request: Request, resource: StoredResource, cache_control: str) -> Response:
+    """Serve a stored resource with a strong ETag, answering 304 when the client has it."""
+    encoding = negotiate_encoding(request, resource.encodings)
+
+    # Each encoded representation has its own strong validator
+    etag = f'"{resource.digest}-{encoding}"' if encoding else f'"{resource.digest}"'
+    headers = {"ETag": etag, "Cache-Control": cache_control, "Vary": "Accept-Encoding"}
+
+    if etag_matches(request.headers.get("if-none-match"), etag):
+        return Response(status_code=304, headers=headers)
+
+    if encoding:
+        headers["Content-Encoding"] = encoding
+    return Response(content=resource.body(encoding), media_type="application/json", headers=headers)
@@ -1,4 +1,4 @@
-from fastapi import FastAPI, UploadFile, File, HTTPException
+from fastapi import FastAPI, UploadFile, File, HTTPException, Request
 from fastapi.responses import JSONResponse
 from fastapi.middleware.cors import CORSMiddleware
 import os
@@ -8,11 +8,22 @@ from config import (
     UPLOAD_DIR,
     SUMMARY_LENGTHS,
     DEFAULT_SUMMARY_LENGTH,
+    EXTRACTIVE_MODE,
+    EXTRACTIVE_SENTENCE_COUNTS,
     CORS_ORIGINS,
     CORS_CREDENTIALS,
     CORS_METHODS,
     CORS_HEADERS,
+    OLLAMA_API_URL,
+    OLLAMA_MODEL,
+    OLLAMA_KEEP_ALIVE,
+    OLLAMA_TIMEOUT,
+    SUMMARY_MAX_AGE,
 )
+from ollama_manager import model_keeper
+from extractive import extractive_summary
+from summary_cache import SummaryCache, content_hash
+from http_cache import cached_json_response
 
 app = FastAPI(title="Academic Paper Summarizer")
 
@@ -28,8 +39,20 @@ app.add_middleware(
 # Create uploads directory if it doesn't exist
 os.makedirs(UPLOAD_DIR, exist_ok=True)
 
-# Ollama API endpoint (runs locally, completely free)
-OLLAMA_API_URL = "http://localhost:11434/api/generate"
+# Summaries served by GET /summaries/{hash}/{length}
+summary_cache = SummaryCache("simple")
+
+
+@app.on_event("startup")
+async def startup():
+    """Preload the Ollama model and keep it resident."""
+    model_keeper.start()
+
+
+@app.on_event("shutdown")
+async def shutdown():
+    """Stop the model keeper."""
+    model_keeper.stop()
 
 
 def extract_text_from_pdf(file_path: str) -> str:
@@ -60,7 +83,7 @@ def summarize_text(text: str, summary_length: str = DEFAULT_SUMMARY_LENGTH) -> s
             response = requests.post(
                 OLLAMA_API_URL,
                 json={
-                    "model": "orca-mini",
+                    "model": OLLAMA_MODEL,
                     "prompt": f"""Please summarize the following academic paper. {length_prompt}
                     
 Focus on:
@@ -73,8 +96,9 @@ Paper content:
 {text[:3000]}""",  # Limit text to avoid timeout
                     "stream": False,
                     "temperature": 0.7,
+                    "keep_alive": OLLAMA_KEEP_ALIVE,
                 },
-                timeout=120
+                timeout=OLLAMA_TIMEOUT
             )
             
             if response.status_code == 200:
@@ -111,6 +135,13 @@ async def upload_and_summarize(file: UploadFile = File(...), summary_length: str
         if not file.filename.endswith('.pdf'):
             raise HTTPException(status_code=400, detail="Only PDF files are allowed")
         
+        # Validate summary length
+        if summary_length not in SUMMARY_LENGTHS and summary_length != EXTRACTIVE_MODE:
+            raise HTTPException(
+                status_code=400,
+                detail=f"summary_length must be one of: {', '.join([*SUMMARY_LENGTHS, EXTRACTIVE_MODE])}"
+            )
+        
         # Save uploaded file
         file_path = os.path.join(UPLOAD_DIR, file.filename)
         with open(file_path, 'wb') as f:
@@ -123,8 +154,31 @@ async def upload_and_summarize(file: UploadFile = File(...), summary_length: str
         if not extracted_text.strip():
             raise HTTPException(status_code=400, detail="Could not extract text from PDF")
         
-        # Summarize text
-        summary = summarize_text(extracted_text, summary_length)
+        # Summarize text, falling back to local extractive summary if Ollama fails
+        if summary_length == EXTRACTIVE_MODE:
+            summary = extractive_summary(extracted_text, EXTRACTIVE_SENTENCE_COUNTS[DEFAULT_SUMMARY_LENGTH])
+            method = "extractive"
+        else:
+            try:
+                summary = summarize_text(extracted_text, summary_length)
+                method = "llm"
+            except Exception:
+                sentence_count = EXTRACTIVE_SENTENCE_COUNTS.get(
+                    summary_length, EXTRACTIVE_SENTENCE_COUNTS[DEFAULT_SUMMARY_LENGTH]
+                )
+                summary = extractive_summary(extracted_text, sentence_count)
+                method = "extractive-fallback"
+        
+        # Publish as a cacheable GET resource keyed by paper content
+        paper_hash = content_hash(extracted_text.encode("utf-8"))
+        # A fallback never replaces a stored LLM summary, which summary_url then keeps serving
+        summary_cache.store_resource(paper_hash, summary_length, {
+            "content_hash": paper_hash,
+            "summary_length": summary_length,
+            "model": OLLAMA_MODEL if method == "llm" else None,
+            "summary": summary,
+            "method": method,
+        }, fallback=method == "extractive-fallback")
         
         # Clean up uploaded file
         if file_path and os.path.exists(file_path):
@@ -134,7 +188,10 @@ async def upload_and_summarize(file: UploadFile = File(...), summary_length: str
             "status": "success",
             "filename": file.filename,
             "text_length": len(extracted_text),
-            "summary": summary
+            "summary": summary,
+            "method": method,
+            "content_hash": paper_hash,
+            "summary_url": f"/summaries/{paper_hash}/{summary_length}"
         })
     
     except HTTPException:
@@ -146,12 +203,40 @@ async def upload_and_summarize(file: UploadFile = File(...), summary_length: str
         raise HTTPException(status_code=500, detail=str(e))
 
 
+@app.get("/summaries/{paper_hash}/{summary_length}")
+async def get_summary(paper_hash: str, summary_length: str, request: Request):
+    """Stored summary for a paper, cacheable by browsers and proxies."""
+    resource = summary_cache.load_resource(paper_hash, summary_length)
+    if resource is None:
+        raise HTTPException(status_code=404, detail="Summary not found")
+    
+    # Extractive fallbacks may be replaced by LLM summaries later, so always revalidate them
+    if resource.fallback:
+        cache_control = "public, no-cache"
+    else:
+        cache_control = f"public, max-age={SUMMARY_MAX_AGE}"
+    
+    return cached_json_response(request, resource, cache_control)
+
+
 @app.get("/health")
 async def health_check():
     """Health check endpoint."""
     return {"status": "healthy"}
 
 
+@app.get("/ready")
+async def readiness_check():
+    """Readiness endpoint: 503 until the model's first warm-up, then ready for good.
+
+    Off-hours the model may be evicted and is reloaded by the next request;
+    model_loaded reports that residency without taking the instance out of rotation.
+    """
+    if not model_keeper.ready:
+        return JSONResponse(status_code=503, content={"status": "loading", "model": OLLAMA_MODEL})
+    return {"status": "ready", "model": OLLAMA_MODEL, "model_loaded": model_keeper.loaded}
+
+
 if __name__ == "__main__":
     import uvicorn
     uvicorn.run(app, host="0.0.0.0", port=8001)
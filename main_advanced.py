@@ -3,18 +3,25 @@ Advanced Research Paper Summarizer
 Supports arXiv, IEEE, ACM with section-aware parsing
 """
 
-from fastapi import FastAPI, UploadFile, File, HTTPException, BackgroundTasks
+from fastapi import FastAPI, UploadFile, File, HTTPException, BackgroundTasks, Request
 from fastapi.responses import JSONResponse
 from fastapi.middleware.cors import CORSMiddleware
 import os
 import PyPDF2
-import requests
 import re
-from typing import Optional, Dict, List
+from typing import List
 from pydantic import BaseModel
 import arxiv
 from datetime import datetime
 import json
+from config import OLLAMA_MODEL, EXTRACTIVE_MODE, SUMMARY_MAX_AGE
+from ollama_manager import model_keeper
+from summary_cache import SummaryCache, fingerprint_sections, diff_sections, paper_key
+from paper import Paper, PaperStore
+from figure_index import FigureIndex
+from paper_parser import extract_text_from_pdf, find_section_spans, build_paper
+from section_summarizer import generate_multi_level_summary, generate_methodology_recreation
+from http_cache import cached_json_response
 
 app = FastAPI(title="Advanced Research Paper Summarizer")
 
@@ -31,109 +38,45 @@ app.add_middleware(
 UPLOAD_DIR = "uploads"
 os.makedirs(UPLOAD_DIR, exist_ok=True)
 
-# Ollama API endpoint
-OLLAMA_API_URL = "http://localhost:11434/api/generate"
+# Section summaries from earlier versions of each paper
+summary_cache = SummaryCache("advanced")
 
+# Parsed papers, so requests don't re-extract the PDF
+paper_store = PaperStore()
 
-class PaperSection(BaseModel):
-    """Represents a section of a research paper"""
-    name: str
-    content: str
-    page_range: Optional[tuple] = None
 
+@app.on_event("startup")
+async def startup():
+    """Preload the Ollama model and keep it resident."""
+    model_keeper.start()
 
-class ResearchPaper(BaseModel):
-    """Represents a parsed research paper"""
-    title: str
-    authors: List[str]
-    abstract: str
-    sections: Dict[str, str]
-    full_text: str
-    source: str  # "upload", "arxiv", "ieee", "acm"
-    url: Optional[str] = None
+
+@app.on_event("shutdown")
+async def shutdown():
+    """Stop the model keeper."""
+    model_keeper.stop()
 
 
 class SummaryRequest(BaseModel):
     """Request for paper summary"""
     paper_id: str
-    summary_level: str  # "eli5", "technical", "expert"
+    summary_level: str  # "eli5", "technical", "expert", "extractive"
     include_figures: bool = False
     include_methodology: bool = True
 
 
-# Section patterns for academic papers
-SECTION_PATTERNS = {
-    "abstract": r"(?i)(abstract|summary)\s*\n",
-    "introduction": r"(?i)(1\.|introduction|background)\s*\n",
-    "methodology": r"(?i)(2\.|methodology|methods|approach|proposed method)\s*\n",
-    "results": r"(?i)(3\.|results|findings|experiments|evaluation)\s*\n",
-    "discussion": r"(?i)(4\.|discussion|analysis)\s*\n",
-    "conclusion": r"(?i)(5\.|conclusion|conclusions|future work)\s*\n",
-    "references": r"(?i)(references|bibliography)\s*\n",
-}
-
-
-def extract_text_from_pdf(file_path: str) -> str:
-    """Extract text from PDF file."""
-    try:
-        text = ""
-        with open(file_path, 'rb') as file:
-            pdf_reader = PyPDF2.PdfReader(file)
-            num_pages = len(pdf_reader.pages)
-            
-            for page_num in range(num_pages):
-                page = pdf_reader.pages[page_num]
-                text += page.extract_text()
-        
-        return text
-    except Exception as e:
-        raise Exception(f"Error extracting text from PDF: {str(e)}")
-
-
-def parse_paper_sections(text: str) -> Dict[str, str]:
-    """Parse paper into sections using pattern matching."""
-    sections = {}
-    
-    # Try to find each section
-    for section_name, pattern in SECTION_PATTERNS.items():
-        match = re.search(pattern, text)
-        if match:
-            start = match.start()
-            # Find next section
-            next_start = len(text)
-            for other_pattern in SECTION_PATTERNS.values():
-                if other_pattern != pattern:
-                    other_match = re.search(other_pattern, text[start+1:])
-                    if other_match:
-                        next_start = min(next_start, start + 1 + other_match.start())
-            
-            sections[section_name] = text[start:next_start].strip()
-    
-    return sections
-
-
-def extract_metadata(text: str) -> Dict:
-    """Extract paper metadata (title, authors, etc.)."""
-    lines = text.split('\n')
-    
-    # First non-empty line is likely the title
-    title = ""
-    authors = []
-    
-    for line in lines[:20]:
-        if line.strip() and len(line.strip()) > 10:
-            if not title:
-                title = line.strip()
-            elif "author" in line.lower() or "@" in line:
-                authors.append(line.strip())
-    
-    return {
-        "title": title,
-        "authors": authors,
-    }
+def load_paper(paper_id: str, file_path: str) -> Paper:
+    """Load a parsed paper from the store, extracting and storing it on a miss."""
+    paper = paper_store.load(paper_id, file_path)
+    if paper is None:
+        figure_index = FigureIndex()
+        text = extract_text_from_pdf(file_path, figure_index)
+        paper = build_paper(text, figure_index.entries())
+        paper_store.save(paper_id, paper, file_path)
+    return paper
 
 
-def fetch_arxiv_paper(arxiv_id: str) -> ResearchPaper:
+def fetch_arxiv_paper(arxiv_id: str) -> Paper:
     """Fetch paper from arXiv."""
     try:
         client = arxiv.Client()
@@ -144,91 +87,24 @@ def fetch_arxiv_paper(arxiv_id: str) -> ResearchPaper:
         pdf_path = os.path.join(UPLOAD_DIR, f"{arxiv_id}.pdf")
         
         # Extract text
-        text = extract_text_from_pdf(pdf_path)
-        sections = parse_paper_sections(text)
+        figure_index = FigureIndex()
+        text = extract_text_from_pdf(pdf_path, figure_index)
         
-        return ResearchPaper(
+        return Paper(
             title=paper.title,
             authors=[author.name for author in paper.authors],
             abstract=paper.summary,
-            sections=sections,
-            full_text=text,
+            text=text,
+            section_spans=find_section_spans(text),
             source="arxiv",
-            url=paper.entry_id
+            url=paper.entry_id,
+            figures=figure_index.entries()
         )
     except Exception as e:
         raise Exception(f"Error fetching arXiv paper: {str(e)}")
 
 
-def summarize_section(section_text: str, section_name: str, summary_level: str) -> str:
-    """Summarize a specific section using Ollama."""
-    try:
-        prompts = {
-            "eli5": f"Explain this {section_name} section in simple terms a 5-year-old could understand:\n{section_text[:2000]}",
-            "technical": f"Provide a technical summary of this {section_name} section:\n{section_text[:2000]}",
-            "expert": f"Provide an expert-level analysis of this {section_name} section:\n{section_text[:2000]}"
-        }
-        
-        prompt = prompts.get(summary_level, prompts["technical"])
-        
-        response = requests.post(
-            OLLAMA_API_URL,
-            json={
-                "model": "orca-mini",
-                "prompt": prompt,
-                "stream": False,
-                "temperature": 0.7,
-            },
-            timeout=120
-        )
-        
-        if response.status_code == 200:
-            return response.json().get("response", "")
-        else:
-            raise Exception(f"Ollama error: {response.status_code}")
-    except Exception as e:
-        raise Exception(f"Error summarizing section: {str(e)}")
-
-
-def generate_multi_level_summary(paper: ResearchPaper, summary_level: str) -> Dict:
-    """Generate multi-level summary of paper."""
-    try:
-        summaries = {}
-        
-        # Summarize key sections
-        key_sections = ["abstract", "introduction", "methodology", "results", "conclusion"]
-        
-        for section in key_sections:
-            if section in paper.sections:
-                summaries[section] = summarize_section(
-                    paper.sections[section],
-                    section,
-                    summary_level
-                )
-        
-        return summaries
-    except Exception as e:
-        raise Exception(f"Error generating summary: {str(e)}")
-
-
-def extract_key_figures(text: str) -> List[str]:
-    """Extract references to figures and tables."""
-    figures = re.findall(r"(?i)(figure|fig\.|table|tbl\.)\s+(\d+[a-z]?)", text)
-    return [f"{fig[0]} {fig[1]}" for fig in figures]
-
-
-def generate_methodology_recreation(paper: ResearchPaper) -> str:
-    """Generate a recreation of the methodology section."""
-    if "methodology" in paper.sections:
-        return summarize_section(
-            paper.sections["methodology"],
-            "methodology",
-            "technical"
-        )
-    return "Methodology section not found"
-
-
-def suggest_related_work(paper: ResearchPaper) -> List[str]:
+def suggest_related_work(paper: Paper) -> List[str]:
     """Suggest related papers based on keywords."""
     try:
         # Extract keywords from abstract and introduction
@@ -267,6 +143,7 @@ async def root():
         "features": [
             "Section-aware parsing",
             "Multi-level summaries (ELI5, technical, expert)",
+            "Extractive summaries without an LLM (and as Ollama fallback)",
             "arXiv integration",
             "Figure extraction",
             "Methodology recreation",
@@ -289,28 +166,31 @@ async def upload_paper(file: UploadFile = File(...)):
             content = await file.read()
             f.write(content)
         
-        # Extract text
-        text = extract_text_from_pdf(file_path)
+        # Extract text, indexing figures and tables in the same pass
+        figure_index = FigureIndex()
+        text = extract_text_from_pdf(file_path, figure_index)
         
         if not text.strip():
             raise HTTPException(status_code=400, detail="Could not extract text from PDF")
         
         # Parse sections
-        sections = parse_paper_sections(text)
-        metadata = extract_metadata(text)
-        
-        # Extract figures
-        figures = extract_key_figures(text)
-        
         paper_id = file.filename.replace('.pdf', '')
+        paper = build_paper(text, figure_index.entries())
+        paper_store.save(paper_id, paper, file_path)
+        
+        # Compare against the last summarized version of this paper
+        previous = summary_cache.load(paper_key(paper_id))
+        section_changes = diff_sections(previous["fingerprints"], fingerprint_sections(paper.sections))
         
         return JSONResponse({
             "status": "success",
             "paper_id": paper_id,
-            "title": metadata.get("title", "Unknown"),
-            "authors": metadata.get("authors", []),
-            "sections": list(sections.keys()),
-            "figures": figures,
+            "title": paper.title,
+            "authors": paper.authors,
+            "sections": list(paper.sections.keys()),
+            "figures": paper.figures,
+            "section_changes": section_changes,
+            "content_hash": paper.content_hash,
             "text_length": len(text),
             "page_count": len(PyPDF2.PdfReader(file_path).pages)
         })
@@ -353,37 +233,62 @@ async def summarize_paper(request: SummaryRequest):
         if not os.path.exists(file_path):
             raise HTTPException(status_code=404, detail="Paper not found")
         
-        # Extract and parse
-        text = extract_text_from_pdf(file_path)
-        sections = parse_paper_sections(text)
-        metadata = extract_metadata(text)
-        
-        paper = ResearchPaper(
-            title=metadata.get("title", "Unknown"),
-            authors=metadata.get("authors", []),
-            abstract=sections.get("abstract", ""),
-            sections=sections,
-            full_text=text,
-            source="upload"
-        )
-        
-        # Generate summaries
-        summaries = generate_multi_level_summary(paper, request.summary_level)
-        
-        result = {
-            "status": "success",
-            "paper_id": request.paper_id,
-            "summary_level": request.summary_level,
-            "summaries": summaries,
-        }
-        
-        if request.include_figures:
-            result["figures"] = extract_key_figures(text)
-        
-        if request.include_methodology:
-            result["methodology"] = generate_methodology_recreation(paper)
-        
-        return JSONResponse(result)
+        # Load the parsed paper (extracted once, then memory-mapped from the store)
+        with load_paper(request.paper_id, file_path) as paper:
+            # Only re-summarize sections that changed since the last version of this paper
+            key = paper_key(request.paper_id)
+            fingerprints = fingerprint_sections(paper.sections)
+            record = summary_cache.load(key)
+            section_changes = diff_sections(record["fingerprints"], fingerprints)
+            # Extractive summaries don't depend on the model, so they survive a model change
+            model = None if request.summary_level == EXTRACTIVE_MODE else OLLAMA_MODEL
+            cached = summary_cache.reusable_summaries(record, fingerprints, request.summary_level, model)
+            
+            # Generate summaries
+            summaries, fallback_sections = generate_multi_level_summary(paper, request.summary_level, cached)
+            
+            # Don't cache extractive fallbacks, so the LLM is retried next time
+            summary_cache.store(
+                key,
+                fingerprints,
+                request.summary_level,
+                model,
+                {name: text for name, text in summaries.items() if name not in fallback_sections}
+            )
+            
+            # Publish as a cacheable GET resource keyed by paper content
+            paper_hash = paper.content_hash
+            # Summaries with fallback sections never replace a stored resource
+            stored = summary_cache.store_resource(paper_hash, request.summary_level, {
+                "content_hash": paper_hash,
+                "summary_level": request.summary_level,
+                "model": model,
+                "summaries": summaries,
+                "extractive_fallback": fallback_sections,
+            }, fallback=bool(fallback_sections))
+            
+            result = {
+                "status": "success",
+                "paper_id": request.paper_id,
+                "summary_level": request.summary_level,
+                "summaries": summaries,
+                "extractive_fallback": fallback_sections,
+                "section_changes": section_changes,
+                "reused_sections": [name for name in summaries if name in cached],
+                "content_hash": paper_hash,
+            }
+            if stored:
+                result["summary_url"] = f"/summaries/{paper_hash}/{request.summary_level}"
+            
+            if request.include_figures:
+                result["figures"] = paper.figures
+            
+            if request.include_methodology:
+                # Skip the LLM for methodology too if it already failed for this paper
+                methodology_level = EXTRACTIVE_MODE if fallback_sections else request.summary_level
+                result["methodology"] = generate_methodology_recreation(paper, methodology_level)
+            
+            return JSONResponse(result)
     
     except HTTPException:
         raise
@@ -391,6 +296,22 @@ async def summarize_paper(request: SummaryRequest):
         raise HTTPException(status_code=500, detail=str(e))
 
 
+@app.get("/summaries/{paper_hash}/{summary_level}")
+async def get_summaries(paper_hash: str, summary_level: str, request: Request):
+    """Stored summaries for a paper, cacheable by browsers and proxies."""
+    resource = summary_cache.load_resource(paper_hash, summary_level)
+    if resource is None:
+        raise HTTPException(status_code=404, detail="Summary not found")
+    
+    # Extractive fallbacks may be replaced by LLM summaries later, so always revalidate them
+    if resource.fallback:
+        cache_control = "public, no-cache"
+    else:
+        cache_control = f"public, max-age={SUMMARY_MAX_AGE}"
+    
+    return cached_json_response(request, resource, cache_control)
+
+
 @app.get("/related-work/{paper_id}")
 async def get_related_work(paper_id: str):
     """Get related work suggestions."""
@@ -400,20 +321,8 @@ async def get_related_work(paper_id: str):
         if not os.path.exists(file_path):
             raise HTTPException(status_code=404, detail="Paper not found")
         
-        text = extract_text_from_pdf(file_path)
-        sections = parse_paper_sections(text)
-        metadata = extract_metadata(text)
-        
-        paper = ResearchPaper(
-            title=metadata.get("title", "Unknown"),
-            authors=metadata.get("authors", []),
-            abstract=sections.get("abstract", ""),
-            sections=sections,
-            full_text=text,
-            source="upload"
-        )
-        
-        related = suggest_related_work(paper)
+        with load_paper(paper_id, file_path) as paper:
+            related = suggest_related_work(paper)
         
         return JSONResponse({
             "status": "success",
@@ -433,6 +342,18 @@ async def health_check():
     return {"status": "healthy"}
 
 
+@app.get("/ready")
+async def readiness_check():
+    """Readiness endpoint: 503 until the model's first warm-up, then ready for good.
+
+    Off-hours the model may be evicted and is reloaded by the next request;
+    model_loaded reports that residency without taking the instance out of rotation.
+    """
+    if not model_keeper.ready:
+        return JSONResponse(status_code=503, content={"status": "loading", "model": OLLAMA_MODEL})
+    return {"status": "ready", "model": OLLAMA_MODEL, "model_loaded": model_keeper.loaded}
+
+
 if __name__ == "__main__":
     import uvicorn
     uvicorn.run(app, host="0.0.0.0", port=8001)
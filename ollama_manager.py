@@ -0,0 +1,103 @@
+"""
+Ollama model residency management
+Preloads the configured model at startup and keeps it loaded during business hours
+"""
+
+import threading
+from datetime import datetime
+from typing import Optional
+
+import requests
+
+from config import (
+    OLLAMA_BASE_URL,
+    OLLAMA_API_URL,
+    OLLAMA_MODEL,
+    OLLAMA_KEEP_ALIVE,
+    OLLAMA_LOAD_TIMEOUT,
+    MODEL_KEEPER_INTERVAL,
+    MODEL_KEEPER_DAYS,
+    MODEL_KEEPER_HOURS,
+)
+
+
+def preload_model(model: str = OLLAMA_MODEL) -> bool:
+    """Load the model into memory (Ollama loads a model on an empty prompt)."""
+    try:
+        response = requests.post(
+            OLLAMA_API_URL,
+            json={
+                "model": model,
+                "prompt": "",
+                "stream": False,
+                "keep_alive": OLLAMA_KEEP_ALIVE,
+            },
+            timeout=OLLAMA_LOAD_TIMEOUT
+        )
+        return response.status_code == 200
+    except requests.exceptions.RequestException:
+        return False
+
+
+def is_model_loaded(model: str = OLLAMA_MODEL) -> bool:
+    """Check whether Ollama currently has the model in memory."""
+    try:
+        response = requests.get(f"{OLLAMA_BASE_URL}/api/ps", timeout=5)
+        if response.status_code != 200:
+            return False
+        loaded = response.json().get("models", [])
+    except (requests.exceptions.RequestException, ValueError):
+        return False
+
+    # Ollama reports tagged names, e.g. "orca-mini:latest"
+    wanted = model if ":" in model else f"{model}:latest"
+    return any(m.get("name") in (model, wanted) for m in loaded)
+
+
+def within_business_hours(now: Optional[datetime] = None) -> bool:
+    """Return True if the keeper should hold the model loaded at this time."""
+    now = now or datetime.now()
+    start_hour, end_hour = MODEL_KEEPER_HOURS
+    return now.weekday() in MODEL_KEEPER_DAYS and start_hour <= now.hour < end_hour
+
+
+class ModelKeeper:
+    """Background thread that preloads the model and stops it from being evicted."""
+
+    def __init__(self, model: str = OLLAMA_MODEL, interval: int = MODEL_KEEPER_INTERVAL):
+        self.model = model
+        self.interval = interval
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        # Latched after the first successful warm-up; /ready gates on this, not on residency
+        self.ready = False
+        # Last known residency, refreshed every interval (the model may be evicted off-hours)
+        self.loaded = False
+
+    def start(self):
+        """Start the keeper; the first iteration preloads the model."""
+        if self._thread and self._thread.is_alive():
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="ollama-model-keeper", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        """Stop the keeper thread."""
+        self._stop.set()
+        if self._thread:
+            self._thread.join(timeout=5)
+
+    def _run(self):
+        # Warm up at startup (retrying until Ollama is up), then only re-pin during business hours
+        self.loaded = self.ready = preload_model(self.model)
+        while not self._stop.wait(self.interval):
+            if within_business_hours() or not self.ready:
+                # Reloads an evicted model, or just refreshes the keep_alive timer
+                self.loaded = preload_model(self.model)
+                self.ready = self.ready or self.loaded
+            else:
+                self.loaded = is_model_loaded(self.model)
+
+
+model_keeper = ModelKeeper()
@@ -0,0 +1,206 @@
+"""
+Compact paper representation
+The full text is stored once (in memory or memory-mapped from disk) and sections are offset views into it
+"""
+
+import json
+import mmap
+import os
+import re
+from collections.abc import Mapping
+from typing import Dict, List, Optional, Tuple, Union
+
+from config import PAPER_CACHE_DIR
+from summary_cache import content_hash
+
+Span = Tuple[int, int]
+
+# Bump when the stored layout changes so older entries are re-extracted
+STORE_FORMAT = 3
+
+
+class MappedText:
+    """Read-only memory map of a UTF-8 text file. Slices use byte offsets and return str."""
+
+    __slots__ = ("_file", "_buffer")
+
+    def __init__(self, path: str):
+        self._file = open(path, "rb")
+        if os.fstat(self._file.fileno()).st_size:
+            self._buffer = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        else:
+            # mmap cannot map an empty file
+            self._buffer = b""
+
+    def __getitem__(self, key: slice) -> str:
+        return self._buffer[key].decode("utf-8")
+
+    def __len__(self) -> int:
+        return len(self._buffer)
+
+    @property
+    def buffer(self):
+        """The raw UTF-8 bytes (zero-copy)."""
+        return self._buffer
+
+    def __str__(self) -> str:
+        return self._buffer[:].decode("utf-8")
+
+    def close(self):
+        if isinstance(self._buffer, mmap.mmap):
+            self._buffer.close()
+        self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+class SectionView(Mapping):
+    """Section name -> text mapping that slices the shared text on access."""
+
+    __slots__ = ("_text", "spans")
+
+    def __init__(self, text: Union[str, MappedText], spans: Dict[str, Span]):
+        self._text = text
+        self.spans = spans
+
+    def __getitem__(self, name: str) -> str:
+        start, end = self.spans[name]
+        return self._text[start:end]
+
+    def __iter__(self):
+        return iter(self.spans)
+
+    def __len__(self) -> int:
+        return len(self.spans)
+
+
+class Paper:
+    """Parsed paper. Use as a context manager to release a memory-mapped text."""
+
+    __slots__ = ("title", "authors", "abstract", "text", "section_spans", "source", "url", "figures")
+
+    def __init__(self, title: str, authors: List[str], abstract: str,
+                 text: Union[str, MappedText], section_spans: Dict[str, Span],
+                 source: str, url: Optional[str] = None, figures: Optional[List[Dict]] = None):
+        self.title = title
+        self.authors = authors
+        self.abstract = abstract
+        self.text = text
+        self.section_spans = section_spans
+        self.source = source  # "upload", "arxiv", "ieee", "acm"
+        self.url = url
+        self.figures = figures or []  # FigureIndex entries
+
+    @property
+    def sections(self) -> SectionView:
+        return SectionView(self.text, self.section_spans)
+
+    @property
+    def full_text(self) -> str:
+        return str(self.text)
+
+    @property
+    def content_hash(self) -> str:
+        """SHA-256 of the UTF-8 text; a memory-mapped paper is hashed without decoding."""
+        if isinstance(self.text, MappedText):
+            return content_hash(self.text.buffer)
+        return content_hash(self.text.encode("utf-8"))
+
+    def close(self):
+        """Unmap the text if it was loaded from a PaperStore (sections must not be read after)."""
+        if isinstance(self.text, MappedText):
+            self.text.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+def strip_span(text: str, start: int, end: int) -> Span:
+    """Offsets of text[start:end].strip() without copying the slice."""
+    while start < end and text[start].isspace():
+        start += 1
+    while end > start and text[end - 1].isspace():
+        end -= 1
+    return start, end
+
+
+def _byte_spans(text: str, spans: Dict[str, Span]) -> Dict[str, Span]:
+    """Convert character offsets into UTF-8 byte offsets in a single pass."""
+    byte_offsets = {}
+    char_pos = byte_pos = 0
+    for boundary in sorted({offset for span in spans.values() for offset in span}):
+        byte_pos += len(text[char_pos:boundary].encode("utf-8"))
+        char_pos = boundary
+        byte_offsets[boundary] = byte_pos
+    return {name: (byte_offsets[start], byte_offsets[end]) for name, (start, end) in spans.items()}
+
+
+class PaperStore:
+    """Parsed papers on disk: UTF-8 text plus a JSON sidecar, loaded back via mmap."""
+
+    def __init__(self, cache_dir: str = PAPER_CACHE_DIR):
+        self.cache_dir = cache_dir
+        os.makedirs(cache_dir, exist_ok=True)
+
+    def _paths(self, key: str) -> Tuple[str, str]:
+        base = os.path.join(self.cache_dir, re.sub(r"[^\w.-]", "_", key))
+        return f"{base}.txt", f"{base}.json"
+
+    def save(self, key: str, paper: Paper, source_path: Optional[str] = None):
+        """Store a paper parsed from an in-memory string."""
+        text_path, meta_path = self._paths(key)
+        meta = {
+            "format": STORE_FORMAT,
+            "title": paper.title,
+            "authors": paper.authors,
+            "abstract": paper.abstract,
+            "source": paper.source,
+            "url": paper.url,
+            "section_spans": _byte_spans(paper.text, paper.section_spans),
+            "figures": paper.figures,
+            "source_stat": _stat(source_path),
+        }
+        with open(f"{text_path}.tmp", "w", encoding="utf-8", newline="") as f:
+            f.write(paper.text)
+        with open(f"{meta_path}.tmp", "w", encoding="utf-8") as f:
+            json.dump(meta, f)
+        os.replace(f"{text_path}.tmp", text_path)
+        os.replace(f"{meta_path}.tmp", meta_path)
+
+    def load(self, key: str, source_path: Optional[str] = None) -> Optional[Paper]:
+        """Load a stored paper, or None if missing or older than its source file."""
+        text_path, meta_path = self._paths(key)
+        try:
+            with open(meta_path, "r", encoding="utf-8") as f:
+                meta = json.load(f)
+            if meta.get("format") != STORE_FORMAT or meta.get("source_stat") != _stat(source_path):
+                return None
+            text = MappedText(text_path)
+        except (OSError, ValueError):
+            return None
+
+        return Paper(
+            title=meta["title"],
+            authors=meta["authors"],
+            abstract=meta["abstract"],
+            text=text,
+            section_spans={name: tuple(span) for name, span in meta["section_spans"].items()},
+            source=meta["source"],
+            url=meta.get("url"),
+            figures=meta.get("figures"),
+        )
+
+
+def _stat(path: Optional[str]) -> Optional[List[int]]:
+    """Size and mtime of the source PDF, used to detect a replaced file."""
+    if not path or not os.path.exists(path):
+        return None
+    st = os.stat(path)
+    return [st.st_size, st.st_mtime_ns]
@@ -0,0 +1,112 @@
+"""
+PDF text extraction and section parsing
+Free of side effects so the API and the batch CLI (and its worker processes) can share it
+"""
+
+import re
+from typing import Dict, List, Optional, Tuple
+
+import PyPDF2
+
+from paper import Paper, strip_span
+from figure_index import FigureIndex
+
+
+# Section patterns for academic papers
+SECTION_PATTERNS = {
+    "abstract": r"(?i)(abstract|summary)\s*\n",
+    "introduction": r"(?i)(1\.|introduction|background)\s*\n",
+    "methodology": r"(?i)(2\.|methodology|methods|approach|proposed method)\s*\n",
+    "results": r"(?i)(3\.|results|findings|experiments|evaluation)\s*\n",
+    "discussion": r"(?i)(4\.|discussion|analysis)\s*\n",
+    "conclusion": r"(?i)(5\.|conclusion|conclusions|future work)\s*\n",
+    "references": r"(?i)(references|bibliography)\s*\n",
+}
+COMPILED_SECTION_PATTERNS = {name: re.compile(pattern) for name, pattern in SECTION_PATTERNS.items()}
+
+
+def extract_text_from_pdf(file_path: str, figure_index: Optional[FigureIndex] = None) -> str:
+    """Extract text from PDF file.
+    
+    If figure_index is given, figures and tables are indexed page by page
+    in the same pass.
+    """
+    try:
+        pages = []
+        with open(file_path, 'rb') as file:
+            pdf_reader = PyPDF2.PdfReader(file)
+            num_pages = len(pdf_reader.pages)
+            
+            for page_num in range(num_pages):
+                page_text = pdf_reader.pages[page_num].extract_text()
+                pages.append(page_text)
+                if figure_index is not None:
+                    figure_index.add_page(page_num + 1, page_text)
+        
+        return "".join(pages)
+    except Exception as e:
+        raise Exception(f"Error extracting text from PDF: {str(e)}")
+
+
+def find_section_spans(text: str) -> Dict[str, Tuple[int, int]]:
+    """Locate paper sections as (start, end) offsets into text."""
+    spans = {}
+    
+    # Try to find each section
+    for section_name, pattern in COMPILED_SECTION_PATTERNS.items():
+        match = pattern.search(text)
+        if match:
+            start = match.start()
+            # Find next section (searching from an offset avoids copying the tail)
+            next_start = len(text)
+            for other_name, other_pattern in COMPILED_SECTION_PATTERNS.items():
+                if other_name != section_name:
+                    other_match = other_pattern.search(text, start + 1)
+                    if other_match:
+                        next_start = min(next_start, other_match.start())
+            
+            spans[section_name] = strip_span(text, start, next_start)
+    
+    return spans
+
+
+def extract_metadata(text: str) -> Dict:
+    """Extract paper metadata (title, authors, etc.)."""
+    lines = text.split('\n')
+    
+    # First non-empty line is likely the title
+    title = ""
+    authors = []
+    
+    for line in lines[:20]:
+        if line.strip() and len(line.strip()) > 10:
+            if not title:
+                title = line.strip()
+            elif "author" in line.lower() or "@" in line:
+                authors.append(line.strip())
+    
+    return {
+        "title": title,
+        "authors": authors,
+    }
+
+
+def build_paper(text: str, figures: Optional[List[Dict]] = None) -> Paper:
+    """Parse extracted text into a Paper."""
+    spans = find_section_spans(text)
+    metadata = extract_metadata(text)
+    
+    abstract = ""
+    if "abstract" in spans:
+        start, end = spans["abstract"]
+        abstract = text[start:end]
+    
+    return Paper(
+        title=metadata.get("title", "Unknown"),
+        authors=metadata.get("authors", []),
+        abstract=abstract,
+        text=text,
+        section_spans=spans,
+        source="upload",
+        figures=figures
+    )
@@ -0,0 +1,117 @@
+"""
+Section summarization with Ollama, falling back to local extractive summaries
+"""
+
+from typing import Dict, List, Optional, Tuple
+
+import requests
+
+from config import (
+    OLLAMA_API_URL,
+    OLLAMA_MODEL,
+    OLLAMA_KEEP_ALIVE,
+    OLLAMA_TIMEOUT,
+    EXTRACTIVE_MODE,
+    EXTRACTIVE_SECTION_SENTENCES,
+)
+from context_packer import pack_context, context_budget
+from extractive import extractive_summary
+from paper import Paper
+
+
+def summarize_section(section_text: str, section_name: str, summary_level: str) -> str:
+    """Summarize a specific section using Ollama."""
+    try:
+        # Keep the most salient sentences that fit the model's context budget
+        context = pack_context(section_text, context_budget(OLLAMA_MODEL))
+        
+        prompts = {
+            "eli5": f"Explain this {section_name} section in simple terms a 5-year-old could understand:\n{context}",
+            "technical": f"Provide a technical summary of this {section_name} section:\n{context}",
+            "expert": f"Provide an expert-level analysis of this {section_name} section:\n{context}"
+        }
+        
+        prompt = prompts.get(summary_level, prompts["technical"])
+        
+        response = requests.post(
+            OLLAMA_API_URL,
+            json={
+                "model": OLLAMA_MODEL,
+                "prompt": prompt,
+                "stream": False,
+                "temperature": 0.7,
+                "keep_alive": OLLAMA_KEEP_ALIVE,
+            },
+            timeout=OLLAMA_TIMEOUT
+        )
+        
+        if response.status_code == 200:
+            return response.json().get("response", "")
+        else:
+            raise Exception(f"Ollama error: {response.status_code}")
+    except Exception as e:
+        raise Exception(f"Error summarizing section: {str(e)}")
+
+
+def generate_multi_level_summary(paper: Paper, summary_level: str,
+                                 cached: Optional[Dict[str, str]] = None) -> Tuple[Dict, List[str]]:
+    """Generate multi-level summary of paper.
+    
+    Sections present in ``cached`` are reused instead of re-summarized.
+    Returns the section summaries and the sections that fell back to the
+    local extractive summarizer because Ollama failed.
+    """
+    try:
+        cached = cached or {}
+        summaries = {}
+        fallback_sections = []
+        use_llm = summary_level != EXTRACTIVE_MODE
+        
+        # Summarize key sections
+        key_sections = ["abstract", "introduction", "methodology", "results", "conclusion"]
+        
+        for section in key_sections:
+            if section not in paper.sections:
+                continue
+            
+            if section in cached:
+                summaries[section] = cached[section]
+                continue
+            
+            if use_llm:
+                try:
+                    summaries[section] = summarize_section(
+                        paper.sections[section],
+                        section,
+                        summary_level
+                    )
+                    continue
+                except Exception:
+                    # Ollama is down or overloaded: don't wait on it for the remaining sections
+                    use_llm = False
+            
+            if summary_level != EXTRACTIVE_MODE:
+                fallback_sections.append(section)
+            
+            summaries[section] = extractive_summary(paper.sections[section], EXTRACTIVE_SECTION_SENTENCES)
+        
+        return summaries, fallback_sections
+    except Exception as e:
+        raise Exception(f"Error generating summary: {str(e)}")
+
+
+def generate_methodology_recreation(paper: Paper, summary_level: str = "technical") -> str:
+    """Generate a recreation of the methodology section."""
+    if "methodology" not in paper.sections:
+        return "Methodology section not found"
+    
+    if summary_level != EXTRACTIVE_MODE:
+        try:
+            return summarize_section(
+                paper.sections["methodology"],
+                "methodology",
+                "technical"
+            )
+        except Exception:
+            pass
+    return extractive_summary(paper.sections["methodology"], EXTRACTIVE_SECTION_SENTENCES)
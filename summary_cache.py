@@ -0,0 +1,197 @@
+"""
+Section fingerprints and on-disk summary cache
+Lets a new version of a paper reuse summaries of the sections that did not change
+"""
+
+import gzip
+import hashlib
+import json
+import os
+import re
+import threading
+from typing import Dict, List, Optional
+
+from config import SUMMARY_CACHE_DIR
+
+try:
+    import brotli
+except ImportError:  # Optional: without it resources are stored gzip-only
+    brotli = None
+
+# Bodies smaller than this are not worth compressing
+COMPRESS_MIN_BYTES = 1024
+
+# File suffix of each stored content coding of a resource
+ENCODING_SUFFIXES = {None: "", "gzip": ".gz", "br": ".br"}
+
+
+def content_hash(data: bytes) -> str:
+    """Identity of a whole paper: SHA-256 of its extracted UTF-8 text."""
+    return hashlib.sha256(data).hexdigest()
+
+
+def fingerprint_section(text: str) -> str:
+    """Content hash of a section, insensitive to PDF line-wrapping differences."""
+    normalized = re.sub(r"\s+", " ", text).strip()
+    return hashlib.sha256(normalized.encode("utf-8")).hexdigest()[:16]
+
+
+def fingerprint_sections(sections: Dict[str, str]) -> Dict[str, str]:
+    """Fingerprint every parsed section."""
+    return {name: fingerprint_section(text) for name, text in sections.items()}
+
+
+def diff_sections(old: Dict[str, str], new: Dict[str, str]) -> Dict[str, List[str]]:
+    """Compare two fingerprint maps section by section."""
+    return {
+        "added": [name for name in new if name not in old],
+        "removed": [name for name in old if name not in new],
+        "changed": [name for name in new if name in old and old[name] != new[name]],
+        "unchanged": [name for name in new if name in old and old[name] == new[name]],
+    }
+
+
+ARXIV_VERSIONED_ID = re.compile(r"(\d{4}\.\d{4,5})v\d+")
+
+
+def paper_key(paper_id: str) -> str:
+    """Stable cache key across versions of a paper (arXiv "2301.12345v2" -> "2301.12345")."""
+    match = ARXIV_VERSIONED_ID.fullmatch(paper_id)
+    return match.group(1) if match else paper_id
+
+
+def _write_atomic(path: str, data: bytes):
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(data)
+    os.replace(tmp_path, path)
+
+
+class StoredResource:
+    """A GET resource as stored: ETag digest, fallback flag and precompressed bodies on disk."""
+
+    __slots__ = ("path", "digest", "fallback", "encodings")
+
+    def __init__(self, path: str, digest: str, fallback: bool, encodings: List[str]):
+        self.path = path
+        self.digest = digest
+        self.fallback = fallback
+        self.encodings = encodings  # available content codings besides identity
+
+    def body(self, encoding: Optional[str] = None) -> bytes:
+        """The stored bytes for a content coding (None for the uncompressed JSON)."""
+        with open(f"{self.path}{ENCODING_SUFFIXES[encoding]}", "rb") as f:
+            return f.read()
+
+
+class SummaryCache:
+    """Per-paper JSON records of section fingerprints and their summaries.
+
+    Record layout::
+
+        {
+            "fingerprints": {section: fingerprint},
+            "summaries": {level: {section: {"fingerprint", "model" (None if extractive), "summary"}}}
+        }
+    """
+
+    def __init__(self, namespace: str, cache_dir: str = SUMMARY_CACHE_DIR):
+        self.cache_dir = cache_dir
+        # Each app stores its own resource shape, so GET resources are kept apart per app
+        self.resource_dir = os.path.join(cache_dir, "resources", namespace)
+        self._lock = threading.Lock()
+        os.makedirs(self.resource_dir, exist_ok=True)
+
+    def _path(self, key: str) -> str:
+        safe_key = re.sub(r"[^\w.-]", "_", key)
+        return os.path.join(self.cache_dir, f"{safe_key}.json")
+
+    def load(self, key: str) -> Dict:
+        """Load a paper's record, or an empty one."""
+        try:
+            with open(self._path(key), "r", encoding="utf-8") as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {"fingerprints": {}, "summaries": {}}
+
+    def reusable_summaries(self, record: Dict, fingerprints: Dict[str, str], level: str,
+                           model: Optional[str]) -> Dict[str, str]:
+        """Cached summaries whose section content and model still match."""
+        cached = record.get("summaries", {}).get(level, {})
+        return {
+            name: entry["summary"]
+            for name, entry in cached.items()
+            if fingerprints.get(name) == entry.get("fingerprint") and entry.get("model") == model
+        }
+
+    def store(self, key: str, fingerprints: Dict[str, str], level: str, model: Optional[str],
+              summaries: Dict[str, str]):
+        """Record the current fingerprints and the given section summaries."""
+        with self._lock:
+            record = self.load(key)
+            record["fingerprints"] = fingerprints
+            level_cache = record.setdefault("summaries", {}).setdefault(level, {})
+            for name, summary in summaries.items():
+                level_cache[name] = {
+                    "fingerprint": fingerprints[name],
+                    "model": model,
+                    "summary": summary,
+                }
+
+            # Write atomically so a crash never leaves a truncated record
+            path = self._path(key)
+            tmp_path = f"{path}.tmp"
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump(record, f)
+            os.replace(tmp_path, path)
+
+    def _resource_path(self, paper_hash: str, level: str) -> Optional[str]:
+        # Both parts come from the URL; reject anything that isn't a plain hash/level name
+        if not re.fullmatch(r"[0-9a-f]{64}", paper_hash) or not re.fullmatch(r"\w+", level):
+            return None
+        return os.path.join(self.resource_dir, f"{paper_hash}.{level}.json")
+
+    def store_resource(self, paper_hash: str, level: str, resource: Dict, fallback: bool = False) -> bool:
+        """Store the summaries served by GET /summaries/{hash}/{level} as canonical JSON.
+
+        The ETag digest and gzip/br bodies are computed here once, so serving costs no compute.
+        A fallback (extractive instead of LLM) never replaces an existing resource.
+        Returns True if a resource is available at that URL.
+        """
+        path = self._resource_path(paper_hash, level)
+        if path is None:
+            return False
+        if fallback and os.path.exists(f"{path}.meta"):
+            return True
+
+        body = json.dumps(resource, sort_keys=True, separators=(",", ":"), ensure_ascii=False).encode("utf-8")
+        compressors = {"gzip": lambda data: gzip.compress(data, mtime=0)}
+        if brotli is not None:
+            compressors["br"] = brotli.compress
+
+        encodings = []
+        for encoding, compress in compressors.items():
+            if len(body) >= COMPRESS_MIN_BYTES:
+                _write_atomic(f"{path}{ENCODING_SUFFIXES[encoding]}", compress(body))
+                encodings.append(encoding)
+            elif os.path.exists(f"{path}{ENCODING_SUFFIXES[encoding]}"):
+                # Left over from a larger earlier version of this resource
+                os.remove(f"{path}{ENCODING_SUFFIXES[encoding]}")
+        _write_atomic(path, body)
+
+        # Written last: a resource is served only once all its bodies are in place
+        meta = {"digest": hashlib.sha256(body).hexdigest()[:32], "fallback": fallback, "encodings": encodings}
+        _write_atomic(f"{path}.meta", json.dumps(meta).encode("utf-8"))
+        return True
+
+    def load_resource(self, paper_hash: str, level: str) -> Optional[StoredResource]:
+        """The stored resource for a paper and level, or None."""
+        path = self._resource_path(paper_hash, level)
+        if path is None:
+            return None
+        try:
+            with open(f"{path}.meta", "r", encoding="utf-8") as f:
+                meta = json.load(f)
+        except (OSError, ValueError):
+            return None
+        return StoredResource(path, meta["digest"], meta["fallback"], meta["encodings"])